@@ -10,21 +10,39 @@ Usage:
     sudo python3 site_blocker.py --config config.json  # Use a config file
 
 Requires root/admin privileges to modify the hosts file.
+Uses orjson for faster JSON handling if installed (pip install orjson).
+On Linux, installing inotify_simple lets the daemon react to config edits
+immediately instead of waiting for the next poll.
 """
 
 import json
+import mmap
 import os
+import select
 import sys
 import time
 import signal
 import argparse
+import functools
 import socket
 import shutil
 from pathlib import Path
-from datetime import datetime, timedelta
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import threading
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
 # ─── Constants ────────────────────────────────────────────────────────────────
 
 if sys.platform == "win32":
@@ -36,8 +54,16 @@ REDIRECT_IP = "127.0.0.1"
 MARKER_START = "# === SITE BLOCKER START ==="
 MARKER_END = "# === SITE BLOCKER END ==="
 
+MMAP_THRESHOLD = 1 << 20  # hosts files at least this big are read via mmap
+
 DEFAULT_CONFIG_PATH = Path.home() / ".site_blocker" / "config.json"
 
+FLUSH_DELAY = 0.1  # seconds to coalesce API edits before touching disk
+
+DNS_WORKERS = 32
+DNS_CACHE_TTL = 300  # seconds before a resolved site is looked up again
+DNS_INTERVAL = 60  # seconds between DNS monitor passes (well under the TTL)
+
 DEFAULT_BLOCKED = [
     "facebook.com",
     "www.facebook.com",
@@ -56,6 +82,29 @@ DEFAULT_BLOCKED = [
 ]
 
 
+# ─── JSON Helpers ────────────────────────────────────────────────────────────
+
+if orjson is not None:
+    def _json_dumps(data, pretty: bool = False) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(data, pretty: bool = False) -> bytes:
+        return json.dumps(data, indent=2 if pretty else None).encode()
+
+    _json_loads = json.loads
+
+
+def _locked(method):
+    """Run a method while holding the instance's `lock`."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 # ─── Config Manager ──────────────────────────────────────────────────────────
 
 class Config:
@@ -63,24 +112,78 @@ class Config:
 
     def __init__(self, path: str = None):
         self.path = Path(path) if path else DEFAULT_CONFIG_PATH
-        self.blocked_sites: list[str] = []
-        self.exceptions: list[dict] = []  # {"site": ..., "until": ISO timestamp}
+        self.lock = threading.RLock()  # API handlers run on their own threads
+        self._blocked: dict[str, None] = {}  # ordered set of blocked sites
+        self.exceptions: list[dict] = []  # {"site": ..., "until": Unix timestamp}
+        self._exception_until: dict[str, float] = {}  # "until" by site
         self.enabled: bool = True
+        self._stat_key = None  # (mtime_ns, size) of the last parsed file
+        self._dirty = False  # in-memory changes not yet saved
+        self._cached_effective: Optional[list[str]] = None
+        self._cache_valid_until = float("inf")  # earliest exception expiry
         self.load()
 
+    @property
+    def blocked_sites(self) -> list[str]:
+        """Blocked sites in the order they were added."""
+        return list(self._blocked)
+
+    def _invalidate(self):
+        """Drop the cached effective blocklist after any change to its inputs."""
+        self._cached_effective = None
+
+    def _mark_dirty(self):
+        """Record a real change; it reaches disk on the next flush()."""
+        self._dirty = True
+        self._invalidate()
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size)
+
+    @_locked
     def load(self):
-        if self.path.exists():
-            with open(self.path, "r") as f:
-                data = json.load(f)
-            self.blocked_sites = data.get("blocked_sites", DEFAULT_BLOCKED)
+        """Load config from disk, skipping the parse if the file is unchanged."""
+        try:
+            key = self._stat()
+        except FileNotFoundError:
+            key = None
+            if self._stat_key is not None:
+                return  # likely mid-replace by an editor; keep what we have
+        if key is not None:
+            if key == self._stat_key:
+                return
+            try:
+                with open(self.path, "rb") as f:
+                    data = _json_loads(f.read())
+            except ValueError:
+                if self._stat_key is None:
+                    raise  # nothing good to fall back on; don't run blind
+                # Caught mid-write: keep the last good config and leave
+                # _stat_key alone so the next load retries
+                return
+            self._stat_key = key
+            self._dirty = False
+            self._blocked = dict.fromkeys(data.get("blocked_sites", DEFAULT_BLOCKED))
             self.exceptions = data.get("exceptions", [])
             self.enabled = data.get("enabled", True)
         else:
-            self.blocked_sites = list(DEFAULT_BLOCKED)
+            self._blocked = dict.fromkeys(DEFAULT_BLOCKED)
             self.exceptions = []
             self.enabled = True
             self.save()
+        # Configs written by older versions stored ISO timestamps
+        migrated = False
+        for e in self.exceptions:
+            if isinstance(e["until"], str):
+                e["until"] = datetime.fromisoformat(e["until"]).timestamp()
+                migrated = True
+        if migrated:
+            self.save()
+        self._exception_until = {e["site"]: e["until"] for e in self.exceptions}
+        self._invalidate()
 
+    @_locked
     def save(self):
         self.path.parent.mkdir(parents=True, exist_ok=True)
         data = {
@@ -88,9 +191,19 @@ class Config:
             "exceptions": self.exceptions,
             "enabled": self.enabled,
         }
-        with open(self.path, "w") as f:
-            json.dump(data, f, indent=2)
+        with open(self.path, "wb") as f:
+            f.write(_json_dumps(data, pretty=True))
+        # Our own write shouldn't force a reparse on the next tick
+        self._stat_key = self._stat()
+        self._dirty = False
+
+    @_locked
+    def flush(self):
+        """Save only if something changed since the last save."""
+        if self._dirty:
+            self.save()
 
+    @_locked
     def add_site(self, site: str):
         """Add a site to the blocklist (adds both bare and www variants)."""
         site = site.lower().strip()
@@ -99,59 +212,142 @@ class Config:
             variants.add(site[4:])
         else:
             variants.add(f"www.{site}")
-        for v in variants:
-            if v not in self.blocked_sites:
-                self.blocked_sites.append(v)
-        self.save()
+        added = [v for v in variants if v not in self._blocked]
+        for v in added:
+            self._blocked[v] = None
+        if added:
+            self._mark_dirty()
 
+    @_locked
     def remove_site(self, site: str):
         """Remove a site from the blocklist."""
         site = site.lower().strip()
-        variants = [site]
+        variants = {site}
         if site.startswith("www."):
-            variants.append(site[4:])
+            variants.add(site[4:])
         else:
-            variants.append(f"www.{site}")
-        self.blocked_sites = [s for s in self.blocked_sites if s not in variants]
-        self.save()
+            variants.add(f"www.{site}")
+        removed = [v for v in variants if v in self._blocked]
+        for v in removed:
+            del self._blocked[v]
+        if removed:
+            self._mark_dirty()
 
+    @_locked
     def add_exception(self, site: str, minutes: int = 15):
         """Temporarily allow a site for N minutes."""
         site = site.lower().strip()
-        until = (datetime.now() + timedelta(minutes=minutes)).isoformat()
+        until = time.time() + minutes * 60
         # Remove existing exception for same site
         self.exceptions = [e for e in self.exceptions if e["site"] != site]
         self.exceptions.append({"site": site, "until": until})
-        self.save()
+        self._exception_until.pop(site, None)
+        self._exception_until[site] = until
+        self._mark_dirty()
 
+    @_locked
     def remove_exception(self, site: str):
         """Remove a temporary exception."""
         site = site.lower().strip()
+        if site not in self._exception_until:
+            return
         self.exceptions = [e for e in self.exceptions if e["site"] != site]
-        self.save()
+        del self._exception_until[site]
+        self._mark_dirty()
 
+    @_locked
+    def toggle(self):
+        """Flip the blocker on/off."""
+        self.enabled = not self.enabled
+        self._mark_dirty()
+
+    @_locked
     def get_active_exceptions(self) -> list[str]:
         """Return list of sites currently excepted."""
-        now = datetime.now()
-        active = []
-        expired = []
-        for exc in self.exceptions:
-            if datetime.fromisoformat(exc["until"]) > now:
-                active.append(exc["site"])
+        now = time.time()
+        active, expired = [], []
+        for site, until in self._exception_until.items():
+            if until > now:
+                active.append(site)
             else:
-                expired.append(exc)
+                expired.append(site)
         # Clean up expired
         if expired:
-            self.exceptions = [e for e in self.exceptions if e not in expired]
-            self.save()
+            for site in expired:
+                del self._exception_until[site]
+            self.exceptions = [
+                e for e in self.exceptions if e["site"] in self._exception_until
+            ]
+            self._mark_dirty()
         return active
 
+    @_locked
     def get_effective_blocklist(self) -> list[str]:
-        """Return the current blocklist minus active exceptions."""
+        """Return the current blocklist minus active exceptions.
+
+        The result is cached until the config changes or the next exception
+        expires, so repeated status polls don't rescan the blocklist.
+        """
         if not self.enabled:
             return []
-        excepted = self.get_active_exceptions()
-        return [s for s in self.blocked_sites if s not in excepted]
+        if (self._cached_effective is not None
+                and time.time() < self._cache_valid_until):
+            return self._cached_effective
+        excepted = set(self.get_active_exceptions())
+        self._cached_effective = [s for s in self._blocked if s not in excepted]
+        self._cache_valid_until = min(self._exception_until.values(),
+                                      default=float("inf"))
+        return self._cached_effective
+
+
+# ─── Config Watcher ─────────────────────────────────────────────────────────
+
+class ConfigWatcher:
+    """Waits for the config file to change, via inotify when available."""
+
+    def __init__(self, path: Path, stop: Optional[threading.Event] = None):
+        self.path = path
+        self.stop = stop or threading.Event()  # set by wait() once woken
+        # Self-pipe (a socketpair, so select() also works on Windows) that
+        # wake() writes to and wait() always watches
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_w.setblocking(False)
+        self._inotify = None
+        if INotify is not None:
+            try:
+                self._inotify = INotify()
+                self._inotify.add_watch(
+                    str(path.parent),
+                    # Completed writes only, so we don't wake on a truncate
+                    inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO,
+                )
+            except OSError:
+                self._inotify = None
+
+    def wake(self):
+        """End any current or future wait() immediately and set `stop`.
+
+        Only writes a byte to the self-pipe, so it is safe to call from a
+        signal handler; `stop` is set later by wait() on the waiting thread.
+        """
+        try:
+            self._wake_w.send(b"\0")
+        except BlockingIOError:
+            pass  # pipe already full, a wakeup is pending anyway
+
+    def wait(self, timeout: float):
+        """Block until something in the config directory is written,
+        `timeout` seconds pass, or wake() is called."""
+        if self.stop.is_set():
+            return
+        watched = [self._wake_r]
+        if self._inotify is not None:
+            watched.append(self._inotify)
+        ready, _, _ = select.select(watched, [], [], timeout)
+        if self._wake_r in ready:
+            self.stop.set()
+        if self._inotify is not None and self._inotify in ready:
+            self._inotify.read(timeout=0)  # drain the events
 
 
 # ─── Hosts File Manager ──────────────────────────────────────────────────────
@@ -161,53 +357,119 @@ class HostsManager:
 
     def __init__(self, hosts_path: str = HOSTS_PATH):
         self.hosts_path = hosts_path
+        self.lock = threading.Lock()  # serializes writers of the temp file
+        self._last_applied = None  # tuple of sites last written to hosts
+        self._block_text = ""  # rendered block for _last_applied
+        self._hosts_stat = None  # (mtime_ns, size) of hosts after our last write
+        self._clean = ""  # hosts content outside our block, as of _hosts_stat
+
+    def _stat_hosts(self):
+        st = os.stat(self.hosts_path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _get_clean(self) -> str:
+        """Return the hosts content outside our block, re-reading only if
+        the file changed since we last wrote it."""
+        if self._stat_hosts() != self._hosts_stat:
+            self._clean = self._read_clean()
+        return self._clean
 
     def _read_hosts(self) -> str:
         with open(self.hosts_path, "r") as f:
             return f.read()
 
-    def _write_hosts(self, content: str):
-        with open(self.hosts_path, "w") as f:
+    def _write_hosts(self, content: str, sync: bool = False):
+        """Write hosts via a temp file + rename so readers never see a torn file."""
+        tmp = self.hosts_path + ".tmp"
+        with open(tmp, "w") as f:
             f.write(content)
+            if sync:
+                # Only worth the disk flush on shutdown, not every tick
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            # Keep mode/ownership but not the timestamps: the new file must
+            # look modified to anything (nscd, our own stat cache) checking mtime
+            shutil.copymode(self.hosts_path, tmp)
+            if hasattr(os, "chown"):
+                st = os.stat(self.hosts_path)
+                os.chown(tmp, st.st_uid, st.st_gid)
+            os.replace(tmp, self.hosts_path)
+        except OSError:
+            # e.g. a bind-mounted hosts file (containers) can't be renamed over
+            os.remove(tmp)
+            with open(self.hosts_path, "w") as f:
+                f.write(content)
+
+    @staticmethod
+    def _block_span(buf, start_marker, end_marker, newline):
+        """Return (start, end) offsets of our block's lines in `buf`, or None.
+
+        Works on both str and bytes-like buffers (including mmap). Only one
+        block is expected; `end` runs to EOF if the end marker is missing.
+        """
+        start = buf.find(start_marker)
+        if start == -1:
+            return None
+        start = buf.rfind(newline, 0, start) + 1
+        end = buf.find(end_marker, start)
+        if end != -1:
+            end = buf.find(newline, end)
+        return start, len(buf) if end == -1 else end + 1
 
     def _strip_our_entries(self, content: str) -> str:
         """Remove our block between markers."""
-        lines = content.split("\n")
-        result = []
-        inside_block = False
-        for line in lines:
-            if MARKER_START in line:
-                inside_block = True
-                continue
-            if MARKER_END in line:
-                inside_block = False
-                continue
-            if not inside_block:
-                result.append(line)
+        span = self._block_span(content, MARKER_START, MARKER_END, "\n")
+        if span is not None:
+            content = content[:span[0]] + content[span[1]:]
         # Remove trailing blank lines we may have added
-        while result and result[-1].strip() == "":
-            result.pop()
-        return "\n".join(result)
-
+        return content.rstrip()
+
+    def _read_clean(self) -> str:
+        """Read the hosts file with our block already stripped out.
+
+        Large hosts files (e.g. with an external blocklist appended) are
+        mmapped so only the text outside our block is copied into Python.
+        """
+        if os.path.getsize(self.hosts_path) < MMAP_THRESHOLD:
+            return self._strip_our_entries(self._read_hosts())
+        with open(self.hosts_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            span = self._block_span(mm, MARKER_START.encode(),
+                                    MARKER_END.encode(), b"\n")
+            data = mm[:] if span is None else mm[:span[0]] + mm[span[1]:]
+        return data.decode().replace("\r\n", "\n").rstrip()
+
+    @_locked
     def apply_blocklist(self, sites: list[str]):
-        """Write the blocklist into the hosts file."""
-        content = self._read_hosts()
-        clean = self._strip_our_entries(content)
-
-        if sites:
-            block = [f"\n{MARKER_START}"]
-            for site in sites:
-                block.append(f"{REDIRECT_IP}  {site}")
-            block.append(MARKER_END)
-            clean += "\n".join(block) + "\n"
+        """Write the blocklist into the hosts file.
+
+        No-op if the sites are unchanged and nobody else touched the file.
+        """
+        key = tuple(sites)
+        hosts_changed = self._stat_hosts() != self._hosts_stat
+        if key == self._last_applied and not hosts_changed:
+            return
+        clean = self._get_clean()
+
+        if key != self._last_applied:
+            if sites:
+                body = "\n".join(f"{REDIRECT_IP}  {site}" for site in sites)
+                self._block_text = f"\n{MARKER_START}\n{body}\n{MARKER_END}\n"
+            else:
+                self._block_text = ""
 
-        self._write_hosts(clean)
+        self._write_hosts(clean + self._block_text)
+        self._hosts_stat = self._stat_hosts()
+        self._last_applied = key
 
+    @_locked
     def clear(self):
         """Remove all our entries from hosts."""
-        content = self._read_hosts()
-        clean = self._strip_our_entries(content)
-        self._write_hosts(clean)
+        self._write_hosts(self._get_clean(), sync=True)
+        self._hosts_stat = self._stat_hosts()
+        self._last_applied = None
+        self._block_text = ""
 
     def get_current_blocks(self) -> list[str]:
         """Return the sites we currently have in hosts."""
@@ -237,15 +499,58 @@ class DNSMonitor:
     def __init__(self, config: Config):
         self.config = config
         self.resolved_ips: dict[str, str] = {}
+        self._resolved_at: dict[str, float] = {}  # site -> time.monotonic()
+        self._pool = ThreadPoolExecutor(max_workers=DNS_WORKERS,
+                                        thread_name_prefix="dns")
+
+    @staticmethod
+    def _resolve(site: str) -> str:
+        try:
+            infos = socket.getaddrinfo(site, None, proto=socket.IPPROTO_TCP)
+        except (OSError, ValueError):
+            # gaierror, or UnicodeError for malformed names like "a..com"
+            return "unresolved"
+        # A and AAAA records in one lookup; dedupe while keeping order
+        return ", ".join(dict.fromkeys(info[4][0] for info in infos))
 
     def resolve_sites(self):
-        """Resolve current blocked sites to their IPs (informational)."""
-        for site in self.config.blocked_sites:
+        """Resolve current blocked sites to their IPs (informational).
+
+        Results are cached for DNS_CACHE_TTL seconds; only stale or new
+        sites are looked up, and sites no longer blocked are forgotten.
+        """
+        now = time.monotonic()
+        sites = self.config.blocked_sites
+        current = set(sites)
+        for site in [s for s in self._resolved_at if s not in current]:
+            del self._resolved_at[site]
+            self.resolved_ips.pop(site, None)
+        stale = [site for site in sites
+                 if site not in self._resolved_at
+                 or now - self._resolved_at[site] >= DNS_CACHE_TTL]
+        futures = {self._pool.submit(self._resolve, site): site for site in stale}
+        for fut in as_completed(futures):
+            site = futures[fut]
+            self.resolved_ips[site] = fut.result()
+            self._resolved_at[site] = now
+
+    def run(self, stop: threading.Event, interval: float = DNS_INTERVAL):
+        """Resolve sites every `interval` seconds until `stop` is set.
+
+        Meant for a background thread so slow lookups never hold up the
+        main loop's hosts updates.
+        """
+        while not stop.is_set():
             try:
-                ip = socket.gethostbyname(site)
-                self.resolved_ips[site] = ip
-            except socket.gaierror:
-                self.resolved_ips[site] = "unresolved"
+                self.resolve_sites()
+            except Exception as e:
+                # One bad pass shouldn't end monitoring for the process
+                print(f"⚠  DNS monitor pass failed: {e}")
+            stop.wait(interval)
+
+    def shutdown(self):
+        """Stop the resolver pool, dropping any queued lookups."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
     def log_status(self):
         """Print current blocking status."""
@@ -260,22 +565,83 @@ class DNSMonitor:
         print(f"{'─' * 60}")
 
 
+# ─── Flusher ────────────────────────────────────────────────────────────────
+
+class Flusher:
+    """Coalesces bursts of config edits into one hosts apply + config save.
+
+    Each call to dirty() (re)starts a short timer; the flush runs once the
+    edits stop for FLUSH_DELAY seconds.
+    """
+
+    def __init__(self, config: Config, hosts_mgr: HostsManager,
+                 delay: float = FLUSH_DELAY):
+        self.config = config
+        self.hosts_mgr = hosts_mgr
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._closed = False
+
+    def dirty(self):
+        """Schedule a flush, pushing back any one already pending."""
+        with self._lock:
+            if self._closed:
+                return
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(self.delay, self._on_timer)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def close(self):
+        """Stop scheduling flushes and save any pending config edits.
+
+        For shutdown: the hosts file is about to be cleared, so pending
+        edits only need to reach the config file, not hosts.
+        """
+        with self._lock:
+            self._closed = True
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        self.config.flush()
+
+    def _on_timer(self):
+        with self.config.lock:
+            # A timer that fires after close() must not re-apply the
+            # blocklist over a hosts file that shutdown is about to clear
+            if self._closed:
+                return
+            self.hosts_mgr.apply_blocklist(self.config.get_effective_blocklist())
+            self.config.flush()
+
+
 # ─── API Server ───────────────────────────────────────────────────────────────
 
 class APIHandler(SimpleHTTPRequestHandler):
     """Simple HTTP API for the control panel to talk to."""
 
     config: Config = None
-    hosts_mgr: HostsManager = None
+    flusher: Flusher = None
+
+    _CORS_HEADERS = (
+        b"Access-Control-Allow-Origin: *\r\n"
+        b"Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+        b"Access-Control-Allow-Headers: Content-Type\r\n"
+    )
+    _JSON_HEADERS = b"Content-Type: application/json\r\n" + _CORS_HEADERS
 
     def do_GET(self):
         if self.path == "/api/status":
-            self._json_response({
-                "enabled": self.config.enabled,
-                "blocked_sites": self.config.blocked_sites,
-                "exceptions": self.config.exceptions,
-                "effective_blocklist": self.config.get_effective_blocklist(),
-            })
+            with self.config.lock:
+                status = {
+                    "enabled": self.config.enabled,
+                    "blocked_sites": self.config.blocked_sites,
+                    "exceptions": list(self.config.exceptions),
+                    "effective_blocklist": self.config.get_effective_blocklist(),
+                }
+            self._json_response(status)
         elif self.path == "/api/ping":
             self._json_response({"status": "ok"})
         else:
@@ -283,13 +649,13 @@ class APIHandler(SimpleHTTPRequestHandler):
 
     def do_POST(self):
         content_len = int(self.headers.get("Content-Length", 0))
-        body = json.loads(self.rfile.read(content_len)) if content_len else {}
+        body = _json_loads(self.rfile.read(content_len)) if content_len else {}
 
         if self.path == "/api/add_site":
             site = body.get("site", "")
             if site:
                 self.config.add_site(site)
-                self._apply_and_respond(f"Added {site}")
+                self._schedule_and_respond(f"Added {site}")
             else:
                 self._json_response({"error": "No site provided"}, 400)
 
@@ -297,7 +663,7 @@ class APIHandler(SimpleHTTPRequestHandler):
             site = body.get("site", "")
             if site:
                 self.config.remove_site(site)
-                self._apply_and_respond(f"Removed {site}")
+                self._schedule_and_respond(f"Removed {site}")
             else:
                 self._json_response({"error": "No site provided"}, 400)
 
@@ -306,7 +672,7 @@ class APIHandler(SimpleHTTPRequestHandler):
             minutes = body.get("minutes", 15)
             if site:
                 self.config.add_exception(site, minutes)
-                self._apply_and_respond(f"Exception for {site} ({minutes}m)")
+                self._schedule_and_respond(f"Exception for {site} ({minutes}m)")
             else:
                 self._json_response({"error": "No site provided"}, 400)
 
@@ -314,44 +680,46 @@ class APIHandler(SimpleHTTPRequestHandler):
             site = body.get("site", "")
             if site:
                 self.config.remove_exception(site)
-                self._apply_and_respond(f"Removed exception for {site}")
+                self._schedule_and_respond(f"Removed exception for {site}")
             else:
                 self._json_response({"error": "No site provided"}, 400)
 
         elif self.path == "/api/toggle":
-            self.config.enabled = not self.config.enabled
-            self.config.save()
-            self._apply_and_respond(
+            self.config.toggle()
+            self._schedule_and_respond(
                 f"Blocker {'enabled' if self.config.enabled else 'disabled'}"
             )
         else:
             self.send_error(404)
 
-    def _apply_and_respond(self, message: str):
-        effective = self.config.get_effective_blocklist()
-        self.hosts_mgr.apply_blocklist(effective)
-        self._json_response({
-            "message": message,
-            "enabled": self.config.enabled,
-            "blocked_sites": self.config.blocked_sites,
-            "exceptions": self.config.exceptions,
-            "effective_blocklist": effective,
-        })
+    def _schedule_and_respond(self, message: str):
+        # The hosts file is updated by the flusher once edits settle
+        self.flusher.dirty()
+        with self.config.lock:
+            effective = self.config.get_effective_blocklist()
+            response = {
+                "message": message,
+                "enabled": self.config.enabled,
+                "blocked_sites": self.config.blocked_sites,
+                "exceptions": list(self.config.exceptions),
+                "effective_blocklist": effective,
+            }
+        self._json_response(response)
 
     def _json_response(self, data: dict, code: int = 200):
+        payload = _json_dumps(data)
         self.send_response(code)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        # Fixed headers go in as one pre-encoded blob rather than a
+        # send_header() call (and string format) per line
+        self._headers_buffer.append(
+            self._JSON_HEADERS + b"Content-Length: %d\r\n" % len(payload)
+        )
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(payload)
 
     def do_OPTIONS(self):
         self.send_response(204)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self._headers_buffer.append(self._CORS_HEADERS)
         self.end_headers()
 
     def log_message(self, format, *args):
@@ -374,6 +742,8 @@ def main():
         sys.exit(1)
 
     config = Config(args.config)
+    shutdown_evt = threading.Event()
+    watcher = ConfigWatcher(config.path, shutdown_evt)
     hosts_mgr = HostsManager()
     monitor = DNSMonitor(config)
 
@@ -384,36 +754,45 @@ def main():
 
     # Start API server
     APIHandler.config = config
-    APIHandler.hosts_mgr = hosts_mgr
-    server = HTTPServer(("127.0.0.1", args.port), APIHandler)
+    flusher = Flusher(config, hosts_mgr)
+    APIHandler.flusher = flusher
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), APIHandler)
     api_thread = threading.Thread(target=server.serve_forever, daemon=True)
     api_thread.start()
     print(f"✓ API server running on http://127.0.0.1:{args.port}")
     print(f"  Control panel: open the .html file in your browser")
 
-    # Graceful shutdown
-    def cleanup(sig=None, frame=None):
-        print("\n⏻ Shutting down — clearing hosts entries...")
-        hosts_mgr.clear()
-        server.shutdown()
-        config.save()
-        print("✓ Clean shutdown complete.")
-        sys.exit(0)
+    # DNS lookups run on their own cadence, off the main loop
+    dns_thread = threading.Thread(target=monitor.run, args=(shutdown_evt,),
+                                  daemon=True)
+    dns_thread.start()
 
-    signal.signal(signal.SIGINT, cleanup)
-    signal.signal(signal.SIGTERM, cleanup)
+    # Graceful shutdown: the handler only wakes the main loop, which may be
+    # mid-write holding locks; the actual cleanup runs after the loop exits
+    def request_shutdown(sig=None, frame=None):
+        watcher.wake()
 
-    # Main monitoring loop
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
+
+    # Main monitoring loop: wakes on config edits (inotify) or every interval,
+    # which is still needed to notice expired exceptions
     try:
-        while True:
-            config.load()  # Reload config (in case edited externally)
-            effective = config.get_effective_blocklist()
-            hosts_mgr.apply_blocklist(effective)
-            monitor.resolve_sites()
+        while not shutdown_evt.is_set():
+            with config.lock:
+                config.load()  # Reload config (in case edited externally)
+                # Cheap when nothing changed: apply_blocklist only stats hosts
+                hosts_mgr.apply_blocklist(config.get_effective_blocklist())
+                config.flush()  # persist any exceptions that just expired
             monitor.log_status()
-            time.sleep(args.interval)
-    except KeyboardInterrupt:
-        cleanup()
+            watcher.wait(args.interval)
+    finally:
+        print("\n⏻ Shutting down — clearing hosts entries...")
+        server.shutdown()
+        flusher.close()
+        hosts_mgr.clear()
+        monitor.shutdown()
+        print("✓ Clean shutdown complete.")
 
 
 if __name__ == "__main__":
@@ -28,8 +28,10 @@ function groupSites(sites) {
   return Object.keys(groups).sort();
 }
 
-function timeRemaining(isoStr) {
-  const diff = new Date(isoStr) - new Date();
+function timeRemaining(until) {
+  // The daemon sends Unix timestamps in seconds; older versions sent ISO strings
+  const end = typeof until === "number" ? until * 1000 : new Date(until);
+  const diff = end - Date.now();
   if (diff <= 0) return "expired";
   const mins = Math.ceil(diff / 60000);
   return mins > 60 ? `${Math.floor(mins / 60)}h ${mins % 60}m` : `${mins}m`;